@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+import asyncio
+import argparse
+import os
+from playwright.async_api import async_playwright
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Constants
+DEFAULT_PORT = 9222
+ENDPOINT_ENV_VAR = "BROWSER_ENDPOINT"  # e.g. http://127.0.0.1:9222
+WARM_CONTEXTS = 4                      # Contexts kept pre-created and ready to use
+MAX_RESTARTS = 5                       # Browser relaunches allowed per run before giving up
+MAX_REQUEUES = 2                       # Times one team is retried because the browser died under it
+MEMORY_CHECK_INTERVAL = 15             # Seconds between browser memory checks
+BROWSER_PROCESS_NAMES = ("chrom", "headless_shell")
+
+class BrowserUnavailable(RuntimeError):
+    """Raised once the browser is gone for good (restart limit reached or relaunch failed)."""
+
+# ---------------------------
+# Client Helpers (used by FasterMethod.py and SecondPass.py)
+# ---------------------------
+def default_endpoint():
+    """Returns the browser server endpoint from the environment, if one is configured."""
+    return os.environ.get(ENDPOINT_ENV_VAR) or None
+
+async def open_browser(p, endpoint=None, per_context_proxy=False):
+    """Connects to a running browser server over CDP, or launches a local Chromium if none is reachable."""
+    if endpoint:
+        try:
+            browser = await p.chromium.connect_over_cdp(endpoint)
+            print(f"Connected to browser server at {endpoint}")
+            return browser
+        except Exception as e:
+            print(f"Could not connect to browser server at {endpoint}: {e}")
+            print("Falling back to launching a local browser.")
+    if per_context_proxy:
+        # Chromium only honors new_context(proxy=...) when launched with a placeholder global proxy
+        return await p.chromium.launch(headless=True, proxy={"server": "http://per-context"})
+    return await p.chromium.launch(headless=True)
+
+class ContextPool:
+    """Keeps a few browser contexts pre-created so workers never wait on new_context().
+
+    With a ProxyPool, each context is instead created at acquire() time on a leased proxy
+    (so the pool's strategy sees current load), and release() reports whether it worked.
+    """
+
+    def __init__(self, browser, size=WARM_CONTEXTS, proxies=None):
+        self.browser = browser
+        self.proxies = proxies
+        self.size = 0 if proxies else size
+        self.ready = asyncio.Queue()
+        self.refills = set()
+
+    async def start(self):
+        for _ in range(self.size):
+            await self.ready.put(await self.browser.new_context())
+        return self
+
+    async def acquire(self):
+        if self.proxies:
+            proxy = await self.proxies.acquire()
+            try:
+                context = await self.browser.new_context(proxy=proxy.settings)
+            except Exception:
+                await self.proxies.release(proxy, ok=False)
+                raise
+            # Leases live on the ProxyPool so a relaunched browser's pool can still release them
+            self.proxies.leases[context] = proxy
+            return context
+        if not self.ready.empty():
+            return self.ready.get_nowait()
+        return await self.browser.new_context()
+
+    async def release(self, context, ok=True):
+        """Closes a used context and tops the pool back up in the background; ok feeds proxy health."""
+        proxy = self.proxies.leases.pop(context, None) if self.proxies else None
+        if proxy:
+            await self.proxies.release(proxy, ok)
+        try:
+            await context.close()
+        except Exception as e:
+            print("Error closing browser context:", e)
+        if self.ready.qsize() < self.size:
+            task = asyncio.create_task(self._refill())
+            self.refills.add(task)
+            task.add_done_callback(self.refills.discard)
+
+    async def _refill(self):
+        try:
+            await self.ready.put(await self.browser.new_context())
+        except Exception as e:
+            print("Error pre-creating browser context:", e)
+
+    async def close(self):
+        for task in list(self.refills):
+            task.cancel()
+        while not self.ready.empty():
+            try:
+                await self.ready.get_nowait().close()
+            except Exception as e:
+                print("Error closing browser context:", e)
+
+class BrowserSupervisor:
+    """Owns the browser and its ContextPool, relaunching the browser when it disconnects or
+    exceeds a memory limit. Used in place of a ContextPool; run() requeues work that was in
+    flight when the browser went away.
+    """
+
+    def __init__(self, p, endpoint=None, max_restarts=MAX_RESTARTS, memory_limit_mb=None, proxies=None):
+        self.p = p
+        self.endpoint = endpoint
+        self.proxies = proxies
+        self.max_restarts = max_restarts
+        self.memory_limit_mb = memory_limit_mb
+        self.browser = None
+        self.pool = None
+        self.generation = 0
+        self.restarts = 0
+        self.ready = asyncio.Event()
+        self.restarting = None
+        self.monitor = None
+        self.closing = False
+        self.gave_up = False
+        self.recycling = False  # Set while watch_memory() closes the browser on purpose
+        self.recycles = 0
+
+    async def start(self):
+        await self.launch()
+        if self.memory_limit_mb:
+            if psutil is None:
+                print("psutil is not installed; browser memory limit disabled (pip3 install psutil).")
+            elif await asyncio.to_thread(self.browser_rss_mb) == 0:
+                # A browser server (--browser_endpoint) is not our child process, so its memory cannot be measured
+                print("Warning: browser memory limit has no effect on a browser server; "
+                      "it only applies to a browser launched by this process.")
+            else:
+                self.monitor = asyncio.create_task(self.watch_memory())
+        return self
+
+    async def launch(self):
+        self.browser = await open_browser(self.p, self.endpoint, per_context_proxy=self.proxies is not None)
+        self.browser.on("disconnected", self.on_disconnected)
+        self.pool = await ContextPool(self.browser, proxies=self.proxies).start()
+        self.generation += 1
+        self.ready.set()
+
+    def on_disconnected(self, browser):
+        if self.closing or browser is not self.browser or self.restarting:
+            return
+        print("Browser disconnected.")
+        # Hold back new work right away; the relaunch itself runs as a task
+        self.ready.clear()
+        self.restarting = asyncio.create_task(self.restart())
+
+    async def restart(self):
+        try:
+            if self.recycling:
+                # Planned memory recycles are routine on long runs and do not use up the crash budget
+                self.recycling = False
+                self.recycles += 1
+                print(f"Relaunching browser (memory recycle {self.recycles})...")
+            elif self.restarts >= self.max_restarts:
+                print(f"Browser restart limit ({self.max_restarts}) reached; stopping the run.")
+                self.gave_up = True
+                return
+            else:
+                self.restarts += 1
+                print(f"Relaunching browser (restart {self.restarts}/{self.max_restarts})...")
+            await self.launch()
+        except Exception as e:
+            print("Could not relaunch browser; stopping the run:", e)
+            self.gave_up = True
+        finally:
+            self.restarting = None
+            # Wake waiters either way; after giving up they raise BrowserUnavailable instead of working
+            self.ready.set()
+
+    def browser_rss_mb(self):
+        """Resident memory of the locally launched browser processes (children of this process)."""
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    async def watch_memory(self):
+        while True:
+            await asyncio.sleep(MEMORY_CHECK_INTERVAL)
+            if not self.ready.is_set():
+                continue
+            rss = await asyncio.to_thread(self.browser_rss_mb)
+            if rss > self.memory_limit_mb:
+                print(f"Browser using {rss:.0f} MB (limit {self.memory_limit_mb} MB); recycling it.")
+                self.recycling = True
+                try:
+                    # Closing fires the disconnect handler, which relaunches and requeues in-flight work
+                    await self.browser.close()
+                except Exception as e:
+                    print("Error closing browser:", e)
+                    if self.browser.is_connected():
+                        self.recycling = False
+
+    def crashed_since(self, generation):
+        return generation != self.generation or not self.browser.is_connected()
+
+    async def wait_ready(self):
+        await self.ready.wait()
+        if self.gave_up:
+            raise BrowserUnavailable("Browser is gone and will not be relaunched")
+
+    async def run(self, fn, *args):
+        """Awaits fn(*args), retrying it if the browser crashed or was recycled while it ran.
+
+        Raises BrowserUnavailable once the supervisor has given up on the browser.
+        """
+        for attempt in range(MAX_REQUEUES + 1):
+            await self.wait_ready()
+            generation = self.generation
+            try:
+                result = await fn(*args)
+            except Exception as e:
+                # A dead browser usually surfaces as an exception (e.g. from new_page()) rather than a result
+                if not self.crashed_since(generation):
+                    raise
+                if self.gave_up:
+                    raise BrowserUnavailable("Browser is gone and will not be relaunched") from e
+                if attempt == MAX_REQUEUES:
+                    raise
+                print("Browser went away during processing; requeuing.")
+                continue
+            if not self.crashed_since(generation) or attempt == MAX_REQUEUES:
+                return result
+            if self.gave_up:
+                raise BrowserUnavailable("Browser is gone and will not be relaunched")
+            print("Browser went away during processing; requeuing.")
+        return result
+
+    async def acquire(self):
+        await self.wait_ready()
+        return await self.pool.acquire()
+
+    async def release(self, context, ok=True):
+        await self.pool.release(context, ok)
+
+    async def close(self):
+        self.closing = True
+        if self.monitor:
+            self.monitor.cancel()
+        await self.pool.close()
+        try:
+            await self.browser.close()
+        except Exception as e:
+            print("Error closing browser:", e)
+
+# ---------------------------
+# Server
+# ---------------------------
+async def serve(port):
+    """Launches one long-lived Chromium with a CDP endpoint and keeps it running until interrupted."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=[f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"],
+        )
+        endpoint = f"http://127.0.0.1:{port}"
+        print(f"Browser server running. Connect with: export {ENDPOINT_ENV_VAR}={endpoint}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await browser.close()
+
+# ---------------------------
+# Command-Line Argument Parsing
+# ---------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Persistent browser server shared by the scrapers")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Remote debugging (CDP) port to listen on")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    try:
+        asyncio.run(serve(args.port))
+    except KeyboardInterrupt:
+        print("Browser server stopped.")
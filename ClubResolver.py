@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import hashlib
+import re
+import zlib
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+import numpy as np
+from WebsiteCheck import normalize_url
+
+# Constants
+CLUB_FIELDNAMES = ["club_id", "club_name", "state", "club_website", "team_count"]
+MAPPING_FIELDNAMES = ["detail_url", "team", "state", "club_id"]
+HASH_DIM = 1024            # Hashed character-trigram features per name
+CHUNK_ROWS = 512           # Rows of the similarity matrix computed at a time
+STATE_THRESHOLD = 0.78     # Cosine similarity to merge two names within a state
+DOMAIN_THRESHOLD = 0.5     # Looser threshold for names that share a website domain
+MIN_TYPO_TOKEN = 4         # Shortest token allowed to match another with a one-character typo
+STOP_TOKENS = {"the", "fc", "sc", "soccer", "club", "inc", "llc", "youth"}
+# Hosting/social domains shared by unrelated clubs; never used as a blocking key
+SHARED_HOST_DOMAINS = {
+    "facebook.com", "instagram.com", "twitter.com", "sites.google.com", "google.com",
+    "leagueapps.com", "demosphere.com", "sportsengine.com", "teamsnap.com", "wixsite.com",
+    "gotsport.com", "rankings.gotsport.com", "squarespace.com", "weebly.com", "bluesombrero.com",
+}
+
+# ---------------------------
+# Canonicalization Helpers
+# ---------------------------
+def name_tokens(name):
+    """Lowercased words of a club name with punctuation removed; filler tokens are kept."""
+    # Periods are dropped rather than split on, so "F.C." reads as the filler token "fc"
+    text = (name or "").lower().replace("&", " and ").replace(".", "")
+    return re.sub(r"[^a-z0-9 ]+", " ", text).split()
+
+def canonical_name(name):
+    """Lowercases, drops punctuation and filler tokens (FC, SC, Soccer Club...) from a club name."""
+    tokens = name_tokens(name)
+    kept = [t for t in tokens if t not in STOP_TOKENS]
+    return " ".join(kept or tokens)
+
+def website_domain(url):
+    normalized = normalize_url(url)
+    if not normalized:
+        return ""
+    host = urlsplit(normalized).hostname or ""
+    host = host[4:] if host.startswith("www.") else host
+    if host in SHARED_HOST_DOMAINS or any(host.endswith("." + d) for d in SHARED_HOST_DOMAINS):
+        return ""
+    return host
+
+def within_one_edit(a, b):
+    """True if a and b differ by at most one inserted, deleted or substituted character."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    return a[i+1:] == b[i+1:] or a[i+1:] == b[i:] or a[i:] == b[i+1:]
+
+def tokens_match(a, b):
+    # Short tokens (usa, ca) and numbers (2008 vs 2009) must match exactly; longer words tolerate one typo
+    return a == b or (min(len(a), len(b)) >= MIN_TYPO_TOKEN and a.isalpha() and b.isalpha() and within_one_edit(a, b))
+
+def same_tokens(a, b):
+    """Within a state: the canonical names have the same tokens in order, allowing one typo per token.
+
+    Trigram similarity alone merges 'sporting california usa' with 'sporting california arsenal'.
+    """
+    ta, tb = a.split(), b.split()
+    return len(ta) == len(tb) and all(tokens_match(x, y) for x, y in zip(ta, tb))
+
+def shared_token(a, b):
+    """Within a website domain: the canonical names share at least one token."""
+    return any(tokens_match(x, y) for x in a.split() for y in b.split())
+
+def trigram_vectors(names):
+    """Returns an L2-normalized (len(names), HASH_DIM) float32 matrix of hashed character trigrams."""
+    matrix = np.zeros((len(names), HASH_DIM), dtype=np.float32)
+    for i, name in enumerate(names):
+        padded = f"  {name} "
+        for j in range(len(padded) - 2):
+            matrix[i, zlib.crc32(padded[j:j+3].encode("utf-8")) % HASH_DIM] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+# ---------------------------
+# Union-Find over (state, canonical name) nodes
+# ---------------------------
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+def match_block(node_ids, vectors, names, threshold, same_club, uf):
+    """Unions pairs within one block whose trigram cosine similarity reaches the threshold and that pass same_club.
+
+    Two clusters are only joined when their representatives (union-find roots, the first member of
+    each) also pass, so a chain of near matches cannot pull unrelated names into one club.
+    """
+    if len(node_ids) < 2:
+        return
+    ids = np.asarray(node_ids)
+    block = vectors[ids]
+    for start in range(0, len(ids), CHUNK_ROWS):
+        sims = block[start:start+CHUNK_ROWS] @ block.T
+        rows, cols = np.nonzero(sims >= threshold)
+        for r, c in zip(rows, cols):
+            if start + r >= c:
+                continue
+            a, b = int(ids[start + r]), int(ids[c])
+            if not same_club(names[a], names[b]):
+                continue
+            ra, rb = uf.find(a), uf.find(b)
+            if ra == rb:
+                continue
+            if (ra, rb) != (a, b) and (float(vectors[ra] @ vectors[rb]) < threshold
+                                       or not same_club(names[ra], names[rb])):
+                continue
+            uf.union(a, b)
+
+def names_match(a, b, threshold=STATE_THRESHOLD, same_club=same_tokens):
+    """Whether two raw club names would be merged as a pair by match_block (used by --self_check)."""
+    a, b = canonical_name(a), canonical_name(b)
+    vectors = trigram_vectors([a, b])
+    return a == b or (float(vectors[0] @ vectors[1]) >= threshold and same_club(a, b))
+
+# Real club name pairs the resolver must keep apart or merge; run with --self_check after tuning
+NAME_PAIR_CHECKS = [
+    ("Sporting California USA", "Sporting California Arsenal", False),
+    ("Albion SC San Diego", "Albion SC Los Angeles", False),
+    ("Dallas Texans", "Houston Texans", False),
+    ("Real Colorado", "Real Colorodo", True),
+    ("Solar SC", "Solar Soccer Club", True),
+    ("FC Dallas", "Dallas FC", True),
+    ("Slammers FC", "Slammers F.C.", True),
+]
+
+def self_check():
+    failures = 0
+    for a, b, expected in NAME_PAIR_CHECKS:
+        result = names_match(a, b)
+        if result != expected:
+            failures += 1
+        print(f"{'ok  ' if result == expected else 'FAIL'} {a!r} vs {b!r}: merged={result}, expected={expected}")
+    return failures
+
+# ---------------------------
+# Resolution
+# ---------------------------
+def resolve_clubs(rows):
+    """Groups team rows into clubs; returns (club_rows, mapping_rows)."""
+    # Exact (state, canonical name) duplicates collapse into one node before any fuzzy matching
+    node_index = {}
+    node_keys = []
+    row_nodes = []
+    for row in rows:
+        canonical = canonical_name(row.get("club_name"))
+        if not canonical:
+            row_nodes.append(None)
+            continue
+        key = ((row.get("state") or "").strip(), canonical)
+        if key not in node_index:
+            node_index[key] = len(node_keys)
+            node_keys.append(key)
+        row_nodes.append(node_index[key])
+    print(f"{len(rows)} team rows collapse to {len(node_keys)} distinct (state, club name) pairs.")
+
+    canonical_names = [canonical for _, canonical in node_keys]
+    vectors = trigram_vectors(canonical_names)
+    uf = UnionFind(len(node_keys))
+
+    state_blocks = defaultdict(list)
+    for node, (state, _) in enumerate(node_keys):
+        state_blocks[state].append(node)
+    for node_ids in state_blocks.values():
+        match_block(node_ids, vectors, canonical_names, STATE_THRESHOLD, same_tokens, uf)
+
+    domain_blocks = defaultdict(set)
+    for row, node in zip(rows, row_nodes):
+        domain = website_domain(row.get("club_website"))
+        if node is not None and domain:
+            domain_blocks[domain].add(node)
+    for node_ids in domain_blocks.values():
+        match_block(sorted(node_ids), vectors, canonical_names, DOMAIN_THRESHOLD, shared_token, uf)
+
+    # Summarize each cluster; the ID hashes the cluster's most common (state, canonical) key so it is stable across runs
+    cluster_rows = defaultdict(list)
+    for row, node in zip(rows, row_nodes):
+        if node is not None:
+            cluster_rows[uf.find(node)].append((row, node))
+    club_rows = []
+    club_ids = {}
+    for root, members in cluster_rows.items():
+        key_counts = Counter(node_keys[node] for _, node in members)
+        state, canonical = min(key_counts, key=lambda k: (-key_counts[k], k))
+        club_id = "club_" + hashlib.sha1(f"{state}|{canonical}".encode("utf-8")).hexdigest()[:12]
+        club_ids[root] = club_id
+        names = Counter(row["club_name"].strip() for row, _ in members)
+        websites = Counter(normalize_url(row.get("club_website")) for row, _ in members)
+        websites.pop("", None)
+        club_rows.append({
+            "club_id": club_id,
+            "club_name": min(names, key=lambda n: (-names[n], n)),
+            "state": state,
+            "club_website": min(websites, key=lambda w: (-websites[w], w)) if websites else "",
+            "team_count": len(members),
+        })
+
+    mapping_rows = []
+    for row, node in zip(rows, row_nodes):
+        mapping_rows.append({
+            "detail_url": row.get("detail_url", ""),
+            "team": row.get("team", ""),
+            "state": row.get("state", ""),
+            "club_id": club_ids[uf.find(node)] if node is not None else "",
+        })
+    club_rows.sort(key=lambda c: (c["state"], c["club_name"]))
+    return club_rows, mapping_rows
+
+# ---------------------------
+# CSV Helper Functions
+# ---------------------------
+def read_rows(filenames):
+    rows = []
+    for filename in filenames:
+        with open(filename, newline="", encoding="utf-8") as csvfile:
+            rows.extend(csv.DictReader(csvfile))
+    return rows
+
+def write_rows(filename, fieldnames, rows):
+    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+# ---------------------------
+# Command-Line Argument Parsing
+# ---------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Resolve team rows from the scrapers into a deduplicated club table")
+    parser.add_argument("--inputs", type=str, nargs="+", help="Scraper output CSV files (any number of ranking lists)")
+    parser.add_argument("--clubs", type=str, help="Output CSV of resolved clubs with stable club_id")
+    parser.add_argument("--mapping", type=str, help="Output CSV mapping each team (detail_url) to its club_id")
+    parser.add_argument("--self_check", action="store_true", help="Check the matcher against known real club name pairs and exit")
+    args = parser.parse_args()
+    if not args.self_check and not (args.inputs and args.clubs and args.mapping):
+        parser.error("--inputs, --clubs and --mapping are required")
+    return args
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if args.self_check:
+        raise SystemExit(1 if self_check() else 0)
+    rows = read_rows(args.inputs)
+    club_rows, mapping_rows = resolve_clubs(rows)
+    write_rows(args.clubs, CLUB_FIELDNAMES, club_rows)
+    write_rows(args.mapping, MAPPING_FIELDNAMES, mapping_rows)
+    print(f"Resolved {len(rows)} team rows into {len(club_rows)} clubs.")
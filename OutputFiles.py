@@ -0,0 +1,275 @@
+import asyncio
+import csv
+import os
+import queue
+import shutil
+import threading
+import time
+from urllib.parse import parse_qs, quote, urlparse
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Constants
+PARTITION_COLUMNS = ["site", "age", "gender"]
+DICTIONARY_COLUMNS = {"state", "club_name", "site", "age", "gender"}
+INT_COLUMNS = {"club_name_absent_at", "website_absent_at"}
+PARQUET_COMPRESSION = "zstd"
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+WRITER_QUEUE_SIZE = 64     # Pending write requests before submitters wait for the writer thread
+FLUSH_RECORDS = 500        # Buffered records that trigger a flush
+FLUSH_INTERVAL = 5.0       # Seconds before buffered records are flushed regardless of count
+
+def is_parquet(filename):
+    return filename.lower().endswith((".parquet", ".pq"))
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet output requires the pyarrow package: pip3 install pyarrow")
+
+def listing_partition(start_url):
+    """Derives the site/age/gender partition values from a rankings start URL."""
+    qs = parse_qs(urlparse(start_url).query)
+    return {
+        "site": start_url,
+        "age": qs.get("age", [""])[0],
+        "gender": qs.get("gender", [""])[0],
+    }
+
+# ---------------------------
+# Writers (one per output file)
+# ---------------------------
+class CsvOutput:
+    """Writes records to a CSV file; append=True continues an existing file instead of replacing it."""
+
+    def __init__(self, filename, fieldnames, append=False):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        resume = append and os.path.exists(filename) and os.path.getsize(filename) > 0
+        if resume:
+            upgrade_csv_header(filename, fieldnames)
+        self.csvfile = open(filename, "a" if resume else "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.csvfile, fieldnames=fieldnames, extrasaction="ignore")
+        if not resume:
+            self.writer.writeheader()
+
+    def write(self, records):
+        if records:
+            self.writer.writerows(records)
+            self.csvfile.flush()
+
+    def sync(self):
+        self.csvfile.flush()
+        os.fsync(self.csvfile.fileno())
+
+    def close(self):
+        self.csvfile.close()
+
+def upgrade_csv_header(filename, fieldnames):
+    """Rewrites an existing CSV under fieldnames if its header differs, so appended rows line up."""
+    with open(filename, newline="", encoding="utf-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        if reader.fieldnames == list(fieldnames):
+            return
+        rows = list(reader)
+    tmp_path = filename + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, filename)
+
+class ParquetOutput:
+    """Writes records to a Parquet dataset directory, one part file per sync() (i.e. per checkpoint).
+
+    site/age/gender are real partition columns (site=.../age=.../gender=... directories), and
+    state and club_name are dictionary-encoded. Each part file is complete once renamed into
+    place, so the dataset stays readable mid-run and a crash only loses the unsynced records.
+    constants supplies column values shared by every record, such as listing_partition().
+    """
+
+    def __init__(self, filename, fieldnames, constants=None):
+        require_pyarrow()
+        self.filename = filename
+        self.constants = constants or {}
+        columns = list(fieldnames) + [c for c in self.constants if c not in fieldnames]
+        self.partition_columns = [c for c in PARTITION_COLUMNS if c in columns]
+        self.fieldnames = [c for c in columns if c not in self.partition_columns]
+        self.schema = pa.schema([(name, column_type(name)) for name in self.fieldnames])
+        self.pending = []
+        self.parts = 0
+        # Like opening a CSV with "w", a new output replaces the previous run's dataset
+        if os.path.isdir(filename):
+            shutil.rmtree(filename)
+        elif os.path.exists(filename):
+            os.remove(filename)
+        os.makedirs(filename)
+
+    def write(self, records):
+        self.pending.extend(records)
+
+    def sync(self):
+        groups = {}
+        for record in self.pending:
+            values = tuple(self.constants.get(c, record.get(c)) for c in self.partition_columns)
+            groups.setdefault(values, []).append(record)
+        for values, records in groups.items():
+            self.write_part(values, records)
+        self.pending = []
+
+    def write_part(self, values, records):
+        directory = os.path.join(self.filename, *(partition_segment(c, v) for c, v in zip(self.partition_columns, values)))
+        os.makedirs(directory, exist_ok=True)
+        columns = {name: [to_column_value(name, record.get(name)) for record in records] for name in self.fieldnames}
+        path = os.path.join(directory, f"part-{self.parts:05d}.parquet")
+        # Dot-prefixed temp files are ignored by Parquet readers until renamed into place
+        tmp_path = os.path.join(directory, f".part-{self.parts:05d}.parquet.tmp")
+        self.parts += 1
+        with open(tmp_path, "wb") as sink:
+            pq.write_table(pa.Table.from_pydict(columns, schema=self.schema), sink, compression=PARQUET_COMPRESSION,
+                           use_dictionary=[n for n in self.fieldnames if n in DICTIONARY_COLUMNS])
+            sink.flush()
+            os.fsync(sink.fileno())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self.sync()
+
+# ---------------------------
+# Background Writer (keeps disk I/O off the event loop)
+# ---------------------------
+class BackgroundWriter:
+    """Feeds a CsvOutput/ParquetOutput from a dedicated thread through a bounded queue.
+
+    Records are buffered and flushed every FLUSH_RECORDS records or FLUSH_INTERVAL seconds;
+    checkpoint() flushes and fsyncs, and close() drains everything before closing the file.
+    """
+
+    CHECKPOINT = object()
+    STOP = object()
+
+    def __init__(self, output, flush_records=FLUSH_RECORDS, flush_interval=FLUSH_INTERVAL):
+        self.output = output
+        self.filename = output.filename
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        self.buffer = []
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name=f"writer:{self.filename}", daemon=True)
+        self.thread.start()
+
+    async def put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Writer is behind; wait for room in a worker thread rather than on the event loop
+            await asyncio.to_thread(self.queue.put, item)
+
+    async def write(self, records):
+        if self.error:
+            raise RuntimeError(f"Writer for {self.filename} failed") from self.error
+        if records:
+            await self.put(list(records))
+
+    async def checkpoint(self):
+        await self.put(self.CHECKPOINT)
+
+    async def close(self):
+        await self.put(self.STOP)
+        await asyncio.to_thread(self.thread.join)
+        if self.error:
+            raise RuntimeError(f"Writer for {self.filename} failed") from self.error
+
+    def flush(self):
+        if self.buffer:
+            self.output.write(self.buffer)
+            self.buffer = []
+
+    def run(self):
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is self.STOP:
+                self.stop()
+                return
+            try:
+                if item is self.CHECKPOINT:
+                    self.flush()
+                    self.output.sync()
+                elif item is not None:
+                    self.buffer.extend(item)
+                    if len(self.buffer) >= self.flush_records:
+                        self.flush()
+                if item is None or time.monotonic() >= deadline:
+                    self.flush()
+                    deadline = time.monotonic() + self.flush_interval
+            except Exception as e:
+                print(f"Error writing to {self.filename}: {e}")
+                self.error = e
+                self.buffer = []
+
+    def stop(self):
+        """Final flush, fsync and close; the file is closed even if flushing fails, and close() re-raises."""
+        try:
+            try:
+                self.flush()
+                self.output.sync()
+            finally:
+                self.output.close()
+        except Exception as e:
+            print(f"Error writing to {self.filename}: {e}")
+            self.error = self.error or e
+            self.buffer = []
+
+def column_type(name):
+    if name in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if name in INT_COLUMNS:
+        return pa.int64()
+    return pa.string()
+
+def partition_segment(name, value):
+    """Hive-style directory name for one partition value (URI-encoded, as Parquet readers expect)."""
+    value = "" if value is None else str(value)
+    return f"{name}={quote(value, safe='') if value else HIVE_NULL_PARTITION}"
+
+def to_column_value(name, value):
+    if value is None or value == "":
+        return None
+    if name in INT_COLUMNS:
+        return int(float(value))
+    return str(value)
+
+def open_output(filename, fieldnames, constants=None):
+    """Returns a CsvOutput or ParquetOutput depending on the file extension."""
+    if is_parquet(filename):
+        return ParquetOutput(filename, fieldnames, constants)
+    return CsvOutput(filename, fieldnames)
+
+# ---------------------------
+# Whole-File Helpers (used by SecondPass.py)
+# ---------------------------
+def read_rows(filename):
+    """Reads a CSV or Parquet scraper output into a list of dicts with string values."""
+    if not is_parquet(filename):
+        with open(filename, newline="", encoding="utf-8") as csvfile:
+            return list(csv.DictReader(csvfile))
+    require_pyarrow()
+    rows = pq.read_table(filename).to_pylist()
+    for row in rows:
+        for key, value in row.items():
+            row[key] = "" if value is None else str(value)
+    return rows
+
+def write_rows(filename, fieldnames, rows):
+    output = open_output(filename, fieldnames)
+    output.write(rows)
+    output.close()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# Constants
+INDEX_FILENAME = "index.csv"
+INDEX_FIELDNAMES = ["detail_url", "sha256", "archived_at"]
+ZSTD_LEVEL = 10
+EXTRACT_WORKERS = os.cpu_count() or 4
+EXTRACT_CHUNKSIZE = 64
+
+# Fields re-extracted offline; add an entry here to pull a new field out of the archive.
+# Each value is (xpath, attribute) where attribute None means the element's text.
+FIELD_XPATHS = {
+    "club_name": ("//span[text()='Club Name']/following-sibling::span[1]", None),
+    "club_website": ("//span[text()='Website']/following-sibling::span//a", "href"),
+}
+
+# Resolves every FIELD_XPATHS entry in one evaluation on a live page; missing fields come back as null
+FIELDS_JS = """(fields) => {
+    const values = {};
+    for (const [name, [xpath, attribute]] of Object.entries(fields)) {
+        const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        values[name] = node ? (attribute ? node.getAttribute(attribute) : node.innerText.trim()) : null;
+    }
+    return values;
+}"""
+
+def blob_path(archive_dir, digest):
+    return os.path.join(archive_dir, digest[:2], digest + ".html.zst")
+
+# ---------------------------
+# Archive (written to by FasterMethod.py / SecondPass.py)
+# ---------------------------
+class PageArchive:
+    """Content-addressed, zstd-compressed store of rendered detail pages indexed by detail_url."""
+
+    def __init__(self, archive_dir):
+        if zstandard is None:
+            raise RuntimeError("The page archive requires the zstandard package: pip3 install zstandard")
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, INDEX_FILENAME)
+        os.makedirs(archive_dir, exist_ok=True)
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, "w", newline="", encoding="utf-8") as csvfile:
+                csv.DictWriter(csvfile, fieldnames=INDEX_FIELDNAMES).writeheader()
+        self.level = ZSTD_LEVEL
+        self.index_lock = threading.Lock()
+
+    def save(self, detail_url, html):
+        """Stores the page once per distinct content hash and records detail_url -> hash in the index."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.archive_dir, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                # Compressor objects are not thread-safe; save() runs in worker threads
+                f.write(zstandard.ZstdCompressor(level=self.level).compress(data))
+            os.replace(tmp_path, path)
+        with self.index_lock, open(self.index_path, "a", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=INDEX_FIELDNAMES)
+            writer.writerow({"detail_url": detail_url, "sha256": digest, "archived_at": int(time.time())})
+        return digest
+
+def load_index(archive_dir):
+    """Returns {detail_url: sha256}; later index entries win over earlier ones."""
+    index = {}
+    with open(os.path.join(archive_dir, INDEX_FILENAME), newline="", encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            index[row["detail_url"]] = row["sha256"]
+    return index
+
+# ---------------------------
+# Live Extraction (used by FasterMethod.py / SecondPass.py)
+# ---------------------------
+async def read_fields(page):
+    """Returns {field: value or None} for every FIELD_XPATHS entry on the rendered page, without waiting."""
+    return await page.evaluate(FIELDS_JS, FIELD_XPATHS)
+
+# ---------------------------
+# Offline Extraction (runs in worker processes)
+# ---------------------------
+def extract_fields(html):
+    """Parses rendered page HTML with lxml and returns {field: value} for every entry in FIELD_XPATHS."""
+    tree = lxml_html.fromstring(html)
+    fields = {}
+    for field, (xpath, attribute) in FIELD_XPATHS.items():
+        matches = tree.xpath(xpath)
+        value = None
+        if matches:
+            value = matches[0].get(attribute) if attribute else matches[0].text_content().strip()
+        fields[field] = value
+    return fields
+
+def extract_blob(job):
+    archive_dir, detail_url, digest = job
+    path = blob_path(archive_dir, digest)
+    try:
+        with open(path, "rb") as f:
+            html = zstandard.ZstdDecompressor().decompress(f.read())
+        record = {"detail_url": detail_url}
+        record.update(extract_fields(html))
+        return record
+    except Exception as e:
+        print(f"Could not extract {detail_url} from {path}: {e}")
+        return {"detail_url": detail_url}
+
+def extract_archive(archive_dir, output, workers=EXTRACT_WORKERS):
+    index = load_index(archive_dir)
+    print(f"Re-extracting {len(index)} archived pages with {workers} processes...")
+    fieldnames = ["detail_url"] + list(FIELD_XPATHS)
+    jobs = [(archive_dir, detail_url, digest) for detail_url, digest in index.items()]
+    with open(output, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for record in executor.map(extract_blob, jobs, chunksize=EXTRACT_CHUNKSIZE):
+                writer.writerow(record)
+    print(f"Extraction complete. {len(jobs)} records written to {output}")
+
+# ---------------------------
+# Command-Line Argument Parsing
+# ---------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Re-extract club fields from an archive of rendered detail pages")
+    parser.add_argument("--archive_dir", type=str, required=True, help="Archive directory written with --archive_dir by the scrapers")
+    parser.add_argument("--output", type=str, required=True, help="Output CSV file (detail_url plus one column per extracted field)")
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS, help="Number of extraction processes")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if zstandard is None or lxml_html is None:
+        raise SystemExit("Offline extraction requires the zstandard and lxml packages: pip3 install zstandard lxml")
+    extract_archive(args.archive_dir, args.output, args.workers)
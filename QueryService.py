@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from ClubResolver import STOP_TOKENS, canonical_name, name_tokens, website_domain
+from OutputFiles import is_parquet, read_rows
+
+# Constants
+DEFAULT_PORT = 8765
+RELOAD_INTERVAL = 10       # Seconds between checks for new or changed output files
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+RESULT_FIELDS = ["team", "state", "detail_url", "club_name", "club_website"]
+OUTPUT_PATTERNS = ("*.csv", "*.parquet")
+
+# ---------------------------
+# Index
+# ---------------------------
+def full_name_keys(name):
+    """Full-name prefix keys: all words, plus the name without leading filler words ("the alpha sc", "alpha sc")."""
+    tokens = name_tokens(name)
+    start = 0
+    while start < len(tokens) - 1 and tokens[start] in STOP_TOKENS:
+        start += 1
+    return tuple(dict.fromkeys([" ".join(tokens), " ".join(tokens[start:])]))
+
+class ClubIndex:
+    """Immutable in-memory indexes over scraper output rows.
+
+    Rows are stored once as tuples; the indexes hold compact integer row-id arrays
+    keyed by state, website domain and detail_url, plus sorted lists of canonical
+    club names and of full names (filler words such as FC kept, see full_name_keys) for prefix search.
+    """
+
+    def __init__(self, rows):
+        # Later files (e.g. a SecondPass output) replace earlier rows for the same detail_url
+        latest = {}
+        for position, row in enumerate(rows):
+            latest[(row.get("detail_url") or "").strip() or position] = row
+        self.rows = []
+        self.by_state = defaultdict(lambda: array("I"))
+        self.by_domain = defaultdict(lambda: array("I"))
+        self.by_detail_url = {}
+        by_name = defaultdict(lambda: array("I"))
+        by_full_name = defaultdict(lambda: array("I"))
+        for row in latest.values():
+            row_id = len(self.rows)
+            state = sys.intern((row.get("state") or "").strip())
+            detail_url = (row.get("detail_url") or "").strip()
+            canonical = canonical_name(row.get("club_name"))
+            domain = website_domain(row.get("club_website"))
+            full_names = full_name_keys(row.get("club_name"))
+            self.rows.append((row.get("team") or "", state, detail_url, row.get("club_name") or "",
+                              row.get("club_website") or "", canonical, domain, full_names))
+            self.by_state[state].append(row_id)
+            if domain:
+                self.by_domain[domain].append(row_id)
+            if canonical:
+                by_name[canonical].append(row_id)
+                for full_name in full_names:
+                    by_full_name[full_name].append(row_id)
+            if detail_url:
+                self.by_detail_url[detail_url] = row_id
+        self.names = sorted(by_name)
+        self.name_ids = [by_name[name] for name in self.names]
+        self.full_names = sorted(by_full_name)
+        self.full_name_ids = [by_full_name[name] for name in self.full_names]
+        self.by_state = dict(self.by_state)
+        self.by_domain = dict(self.by_domain)
+        self.loaded_at = time.time()
+
+    @staticmethod
+    def prefix_ids(names, name_ids, prefix):
+        start = bisect_left(names, prefix)
+        for i in range(start, len(names)):
+            if not names[i].startswith(prefix):
+                break
+            yield from name_ids[i]
+
+    def search(self, detail_url=None, state=None, prefix=None, domain=None, limit=DEFAULT_LIMIT):
+        """Returns up to limit rows matching every given filter.
+
+        A prefix made of ordinary words matches canonical names, so "Dallas" finds "FC Dallas".
+        Canonical names drop filler words, so a prefix containing one ("FC", "The", "FC D")
+        is matched against full names instead.
+        """
+        prefix_field = 5
+        if prefix is not None:
+            tokens = name_tokens(prefix)
+            if any(token in STOP_TOKENS for token in tokens):
+                prefix_field = 7
+            prefix = " ".join(tokens)
+        if domain is not None:
+            domain = domain.lower().removeprefix("www.")
+        # Drive the scan from the most selective index and check the other filters per row
+        if detail_url is not None:
+            candidates = [self.by_detail_url[detail_url]] if detail_url in self.by_detail_url else []
+        elif domain is not None:
+            candidates = self.by_domain.get(domain, ())
+        elif state is not None and prefix is None:
+            candidates = self.by_state.get(state, ())
+        elif prefix is not None and prefix_field == 7:
+            candidates = self.prefix_ids(self.full_names, self.full_name_ids, prefix)
+        elif prefix is not None:
+            candidates = self.prefix_ids(self.names, self.name_ids, prefix)
+        else:
+            candidates = range(len(self.rows))
+        results = []
+        for row_id in candidates:
+            row = self.rows[row_id]
+            if state is not None and row[1] != state:
+                continue
+            if prefix is not None and not any(name.startswith(prefix) for name in
+                                              (row[7] if prefix_field == 7 else (row[5],))):
+                continue
+            if domain is not None and row[6] != domain:
+                continue
+            results.append(dict(zip(RESULT_FIELDS, row)))
+            if len(results) >= limit:
+                break
+        return results
+
+def output_files(paths):
+    """Expands files and directories (all CSV/Parquet outputs inside) into a sorted file list."""
+    files = []
+    for path in paths:
+        # A .parquet directory is one partitioned dataset, not a folder of outputs
+        if os.path.isdir(path) and not is_parquet(path):
+            for pattern in OUTPUT_PATTERNS:
+                files.extend(glob.glob(os.path.join(path, pattern)))
+        elif os.path.exists(path):
+            files.append(path)
+    return sorted(set(files), key=lambda f: (output_signature(f)[0], f))
+
+def output_signature(path):
+    """(mtime, size) of an output file, or of the newest/total part files in a Parquet dataset directory."""
+    if not os.path.isdir(path):
+        return os.path.getmtime(path), os.path.getsize(path)
+    mtime, size = os.path.getmtime(path), 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            full = os.path.join(root, name)
+            mtime = max(mtime, os.path.getmtime(full))
+            size += os.path.getsize(full)
+    return mtime, size
+
+def load_index(paths):
+    rows = []
+    for filename in output_files(paths):
+        try:
+            rows.extend(read_rows(filename))
+        except Exception as e:
+            print(f"Skipping {filename}: {e}")
+    return ClubIndex(rows)
+
+# ---------------------------
+# Hot Reload
+# ---------------------------
+class IndexHolder:
+    """Serves the current ClubIndex and swaps in a rebuilt one when the output files change."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.signature = self.file_signature()
+        self.index = load_index(paths)
+        print(f"Loaded {len(self.index.rows)} rows from {len(self.signature)} files.")
+
+    def file_signature(self):
+        return tuple((f,) + output_signature(f) for f in output_files(self.paths))
+
+    def watch(self, interval=RELOAD_INTERVAL):
+        while True:
+            time.sleep(interval)
+            try:
+                signature = self.file_signature()
+                if signature != self.signature:
+                    # Build off to the side; requests keep using the old index until the swap
+                    index = load_index(self.paths)
+                    self.index, self.signature = index, signature
+                    print(f"Reloaded {len(index.rows)} rows from {len(signature)} files.")
+            except Exception as e:
+                print("Error reloading output files:", e)
+
+# ---------------------------
+# HTTP Server
+# ---------------------------
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    holder = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        index = self.holder.index
+        if url.path == "/health":
+            self.send_json(200, {"rows": len(index.rows), "loaded_at": index.loaded_at})
+        elif url.path == "/search":
+            try:
+                limit = min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            except ValueError:
+                self.send_json(400, {"error": "limit must be an integer"})
+                return
+            if "prefix" in params and not name_tokens(params["prefix"]):
+                self.send_json(400, {"error": "prefix must contain letters or digits"})
+                return
+            results = index.search(params.get("detail_url"), params.get("state"),
+                                   params.get("prefix"), params.get("domain"), limit)
+            self.send_json(200, {"count": len(results), "results": results})
+        else:
+            self.send_json(404, {"error": "use /search?state=&prefix=&domain=&detail_url=&limit= or /health"})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate at thousands of lookups per second
+        pass
+
+# ---------------------------
+# Command-Line Argument Parsing
+# ---------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Local query API over scraped club data")
+    parser.add_argument("--inputs", type=str, nargs="+", required=True,
+                        help="Output files or directories of FasterMethod.py/SecondPass.py output (CSV or Parquet)")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--reload_interval", type=float, default=RELOAD_INTERVAL,
+                        help="Seconds between checks for new or changed output files")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    QueryHandler.holder = IndexHolder(args.inputs)
+    threading.Thread(target=QueryHandler.holder.watch, args=(args.reload_interval,), daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+    print(f"Query service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Query service stopped.")
@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+from itertools import count, islice
+
+# Constants
+SCHEDULER_WINDOW = 20000   # Teams held in the priority heap at once (the rest stay in the TeamStore)
+FILL_CHUNK = 5000          # Teams read from the source per worker-thread call
+
+# ---------------------------
+# Priority Functions
+# ---------------------------
+# A priority is called with a team tuple and returns a number; lower numbers are loaded
+# first. Scores may only get worse over time (e.g. once a team's club has been scheduled),
+# which lets the scheduler re-score lazily when an item reaches the top of the heap.
+class ListingOrder:
+    """Original listing order."""
+
+    def __call__(self, team_tuple):
+        return 0
+
+    def dispatched(self, team_tuple):
+        pass
+
+class NewClubsFirst:
+    """Orders teams by how likely their detail page is to reveal a club we have not seen yet.
+
+    0: first team of a club key not yet scheduled
+    1: team with no usable club key
+    2: club already scheduled but not resolved yet
+    3: club already resolved (fast mode fills these without a page load)
+    """
+
+    def __init__(self, key_fn, resolved):
+        self.key_fn = key_fn
+        self.resolved = resolved
+        self.scheduled = set()
+
+    def __call__(self, team_tuple):
+        key = self.key_fn(team_tuple)
+        if key is None:
+            return 1
+        if key in self.resolved:
+            return 3
+        if key in self.scheduled:
+            return 2
+        return 0
+
+    def dispatched(self, team_tuple):
+        key = self.key_fn(team_tuple)
+        if key is not None:
+            self.scheduled.add(key)
+
+# ---------------------------
+# Scheduler
+# ---------------------------
+class PriorityScheduler:
+    """Hands out detail-page batches in priority order over a bounded lookahead window."""
+
+    def __init__(self, items, priority, window=SCHEDULER_WINDOW):
+        self.items = iter(items)
+        self.priority = priority
+        self.window = window
+        self.heap = []
+        self.sequence = count()
+        self.exhausted = False
+
+    async def fill(self, target):
+        # The source may be a spilled TeamStore, so it is read in chunks off the event loop
+        while not self.exhausted and len(self.heap) < target:
+            chunk = await asyncio.to_thread(list, islice(self.items, min(FILL_CHUNK, target - len(self.heap))))
+            if not chunk:
+                self.exhausted = True
+                break
+            for item in chunk:
+                heapq.heappush(self.heap, (self.priority(item), next(self.sequence), item))
+
+    async def next_batch(self, size):
+        """Returns up to size items, best first; an empty list once every item has been handed out."""
+        batch = []
+        # Top up before popping so window items remain to choose from after this batch
+        await self.fill(self.window + size)
+        while self.heap and len(batch) < size:
+            score, seq, item = heapq.heappop(self.heap)
+            current = self.priority(item)
+            if current > score and self.heap and (current, seq) > self.heap[0][:2]:
+                # Score went stale since it was pushed; requeue behind better work
+                heapq.heappush(self.heap, (current, seq, item))
+                continue
+            self.priority.dispatched(item)
+            batch.append(item)
+        return batch
@@ -0,0 +1,74 @@
+import asyncio
+import csv
+import sys
+import tempfile
+
+# Constants
+URL_PREFIX = "https://rankings.gotsport.com"
+MEMORY_BUDGET_MB = 64      # Listing data kept in memory before spilling to disk
+RECORD_OVERHEAD = 120      # Approximate bytes per buffered tuple beyond its string contents
+
+class TeamStore:
+    """Append-only store of (team, detail_url, state, club_name, club_id) listing tuples with bounded memory.
+
+    Records are held as compact tuples with the rankings host stripped from URLs and
+    state strings interned; once the buffer exceeds the memory budget it is spilled to
+    an anonymous temporary file, so memory use does not grow with the size of the run.
+    """
+
+    def __init__(self, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.budget = int(memory_budget_mb * 1024 * 1024)
+        self.buffer = []
+        self.buffer_bytes = 0
+        self.spill_file = None
+        self.spilled = 0
+
+    def __len__(self):
+        return self.spilled + len(self.buffer)
+
+    def append(self, team, detail_url, state, club_name=None, club_id=None):
+        path = detail_url[len(URL_PREFIX):] if detail_url and detail_url.startswith(URL_PREFIX) else detail_url
+        state = sys.intern(state) if state else state
+        self.buffer.append((team, path, state, club_name, club_id))
+        self.buffer_bytes += len(team or "") + len(path or "") + len(club_name or "") + RECORD_OVERHEAD
+
+    async def extend(self, listing_data):
+        for listing_tuple in listing_data:
+            self.append(*listing_tuple)
+        if self.buffer_bytes > self.budget:
+            # Spill in a worker thread so the other site's detail workers keep running
+            records = self.buffer
+            self.buffer = []
+            self.buffer_bytes = 0
+            await asyncio.to_thread(self.spill, records)
+
+    def spill(self, records):
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile("w+", newline="", encoding="utf-8")
+        self.spill_file.seek(0, 2)
+        csv.writer(self.spill_file).writerows(records)
+        self.spilled += len(records)
+
+    def __iter__(self):
+        """Yields (team, detail_url, state, club_name, club_id) tuples in insertion order, spilled records first.
+
+        Reading spilled records touches disk, so async callers should advance this from a worker thread.
+        """
+        if self.spill_file is not None:
+            self.spill_file.flush()
+            self.spill_file.seek(0)
+            for team, path, state, club_name, club_id in csv.reader(self.spill_file):
+                yield self.expand(team, path or None, state or None, club_name or None, club_id or None)
+        for record in list(self.buffer):
+            yield self.expand(*record)
+
+    @staticmethod
+    def expand(team, path, state, club_name, club_id):
+        if path and not path.startswith("http"):
+            path = URL_PREFIX + path
+        return team, path, sys.intern(state) if state else state, club_name, club_id
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
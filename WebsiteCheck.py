@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+import asyncio
+import argparse
+import csv
+import socket
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import aiohttp
+
+# Constants
+CHECK_FIELDNAMES = ["website_normalized", "website_status", "website_final_url"]
+CONCURRENCY_LIMIT = 200    # Total in-flight website checks
+PER_HOST_LIMIT = 4         # Connections to any one host
+REQUEST_TIMEOUT = 15       # Seconds per request (HEAD or GET)
+DNS_CACHE_TTL = 600        # Seconds to cache DNS lookups
+MAX_REDIRECTS = 10
+USER_AGENT = "Mozilla/5.0 (compatible; ClubInfoScraping website check)"
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "_ga"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+UNREACHABLE_STATUSES = {"dns_error", "connect_error"}
+
+# ---------------------------
+# URL Normalization
+# ---------------------------
+def normalize_url(url):
+    """Returns a canonical form of a scraped club website, or '' if it is not a usable web URL.
+
+    http://x.com, https://www.x.com and www.x.com all become http://x.com, so duplicates share
+    one key; check_url still checks the key with the scheme that was scraped (see check_variants).
+    """
+    url = (url or "").strip()
+    if not url or url.lower().startswith(("mailto:", "tel:", "javascript:")):
+        return ""
+    if "://" not in url:
+        url = "http://" + url.lstrip("/")
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Malformed scraped hrefs such as http://foo.com:abc/ or http://[::1
+        return ""
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return ""
+    host = parts.hostname.lower().rstrip(".")
+    netloc = host[4:] if host.startswith("www.") else host
+    if port and port != DEFAULT_PORTS[scheme]:
+        # A non-default port only makes sense with the scheme it was given for
+        netloc += f":{port}"
+    else:
+        scheme = "http"
+    path = parts.path.rstrip("/")
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS])
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+# ---------------------------
+# Reachability Checks
+# ---------------------------
+def scraped_scheme(url):
+    """The scheme a scraped website was given with; bare hosts count as http."""
+    return "https" if (url or "").strip().lower().startswith("https://") else "http"
+
+def check_variants(url, scheme="http"):
+    """URLs to try for a normalized key: the scraped scheme first, then the other one, each on the bare and www. host."""
+    parts = urlsplit(url)
+    if parts.port:
+        schemes = [parts.scheme]
+    else:
+        schemes = [scheme, "http" if scheme == "https" else "https"]
+    hosts = [parts.netloc] if parts.netloc.startswith("www.") else [parts.netloc, "www." + parts.netloc]
+    return [urlunsplit(parts._replace(scheme=s, netloc=h)) for s in schemes for h in hosts]
+
+async def check_url(session, url, scheme="http"):
+    """Checks a normalized URL with the scraped scheme, falling back to the other scheme and the www. host
+    while the site is unreachable (e.g. an HTTPS-only site with port 80 closed)."""
+    first = None
+    for variant in check_variants(url, scheme):
+        status, final_url = await request_status(session, variant)
+        if status not in UNREACHABLE_STATUSES:
+            return status, final_url
+        first = first or (status, final_url)
+    return first
+
+async def request_status(session, url):
+    """HEADs the URL (falling back to GET when HEAD is refused) and returns (status, final_url)."""
+    for method in ("HEAD", "GET"):
+        try:
+            async with session.request(method, url, allow_redirects=True, max_redirects=MAX_REDIRECTS) as response:
+                # Many club sites answer HEAD with 403/405/501; only trust a HEAD that succeeded
+                if method == "HEAD" and response.status >= 400:
+                    continue
+                return str(response.status), str(response.url)
+        except aiohttp.TooManyRedirects:
+            return "too_many_redirects", ""
+        except aiohttp.ClientSSLError:
+            return "ssl_error", ""
+        except aiohttp.ClientConnectorError as e:
+            return ("dns_error" if isinstance(e.os_error, socket.gaierror) else "connect_error"), ""
+        except asyncio.TimeoutError:
+            if method == "GET":
+                return "timeout", ""
+        except Exception as e:
+            if method == "GET":
+                print(f"Error checking {url}: {e}")
+                return "error", ""
+    return "error", ""
+
+async def check_all(urls, concurrency=CONCURRENCY_LIMIT, per_host=PER_HOST_LIMIT, schemes=None):
+    """Checks each distinct URL once with one pooled session; returns {url: (status, final_url)}.
+
+    schemes maps a normalized URL to the scheme it was scraped with (http when absent).
+    """
+    schemes = schemes or {}
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host,
+                                     ttl_dns_cache=DNS_CACHE_TTL, use_dns_cache=True)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    results = {}
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        async def check_with_semaphore(url):
+            async with semaphore:
+                results[url] = await check_url(session, url, schemes.get(url, "http"))
+            if len(results) % 1000 == 0:
+                print(f"Checked {len(results)}/{len(urls)} websites.")
+        await asyncio.gather(*(check_with_semaphore(url) for url in urls))
+    return results
+
+# ---------------------------
+# CSV Stage
+# ---------------------------
+async def check_file(input_file, output_file, concurrency=CONCURRENCY_LIMIT, per_host=PER_HOST_LIMIT):
+    with open(input_file, newline="", encoding="utf-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+    for row in rows:
+        row["website_normalized"] = normalize_url(row.get("club_website"))
+    urls = sorted({row["website_normalized"] for row in rows if row["website_normalized"]})
+    # Check each key with https if any row scraped it that way; the key itself is scheme-insensitive
+    schemes = {}
+    for row in rows:
+        if row["website_normalized"] and schemes.get(row["website_normalized"]) != "https":
+            schemes[row["website_normalized"]] = scraped_scheme(row.get("club_website"))
+    print(f"Read {len(rows)} rows with {len(urls)} distinct websites from {input_file}")
+
+    started = time.monotonic()
+    results = await check_all(urls, concurrency, per_host, schemes)
+    print(f"Checked {len(urls)} websites in {time.monotonic() - started:.1f}s")
+
+    for row in rows:
+        status, final_url = results.get(row["website_normalized"], ("missing", ""))
+        row["website_status"] = status
+        row["website_final_url"] = final_url
+    with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames + [f for f in CHECK_FIELDNAMES if f not in fieldnames])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Website check complete. Results written to {output_file}")
+
+# ---------------------------
+# Command-Line Argument Parsing
+# ---------------------------
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Normalize, deduplicate and validate scraped club websites")
+    parser.add_argument("--input", type=str, required=True, help="Scraper output CSV with a club_website column")
+    parser.add_argument("--output", type=str, required=True, help="Output CSV with website status columns added")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY_LIMIT, help="Total concurrent checks")
+    parser.add_argument("--per_host", type=int, default=PER_HOST_LIMIT, help="Concurrent connections per host")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    asyncio.run(check_file(args.input, args.output, args.concurrency, args.per_host))